@@ -2,35 +2,173 @@
 """
 Script de análisis SEO que verifica la presencia de keywords en elementos clave de las páginas web.
 Lee configuración desde site.config y genera un reporte en Excel con formato condicional.
-Utiliza Selenium para manejar páginas dinámicas.
+Descarga el HTML con una petición HTTP simple y utiliza Selenium solo para
+páginas dinámicas (sin título o H1 en el HTML estático).
 """
 
 import json
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urlparse, urlunparse, parse_qs
 import openpyxl
 from openpyxl.styles import PatternFill
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 import sys
 import os
 import time
+import multiprocessing.util
 import argparse
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter
 from datetime import datetime
 from dotenv import load_dotenv
+import ahocorasick
+import diskcache
 
 # Selenium imports
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
 
-def load_api_key():
-    """Carga la API key desde el archivo .env si existe."""
+# Mensajes de progreso del análisis (nivel INFO; --quiet los reduce a WARNING)
+logger = logging.getLogger('seo')
+
+
+def setup_logging(log_queue, level=logging.INFO):
+    """Envía los logs de 'seo' a una cola atendida por el proceso principal.
+    
+    Se usa en los workers del pool (vía init_worker) y en el proceso principal,
+    de modo que ningún proceso escribe directamente en stdout ni hace flush.
+    """
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+# Sesión HTTP compartida: reutiliza conexiones TCP/TLS hacia googleapis.com
+# (keep-alive) y reintenta errores transitorios del servidor.
+# raise_on_status=False devuelve la última respuesta para que el 429 y el 400
+# sigan manejándose en get_pagespeed_insights. read=False evita reintentar
+# timeouts de lectura: una petición lenta falla tras un solo `timeout`.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        read=False,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+))
+SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class TokenBucket:
+    """Limitador de tasa (token bucket) compartido entre hilos y procesos.
+
+    Permite ráfagas de hasta `capacity` peticiones y luego una petición
+    cada `interval` segundos. El estado vive en memoria compartida, así que
+    los workers del pool que reciben el mismo bucket (ver init_worker)
+    respetan un único límite global.
+    """
+
+    def __init__(self, interval, capacity=2):
+        self.interval = interval
+        self.capacity = capacity
+        self.tokens = multiprocessing.Value('d', capacity, lock=False)
+        self.updated = multiprocessing.Value('d', time.monotonic(), lock=False)
+        self.lock = multiprocessing.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens = min(self.capacity, self.tokens.value + (now - self.updated.value) / self.interval)
+                self.updated.value = now
+                if tokens >= 1:
+                    self.tokens.value = tokens - 1
+                    return
+                self.tokens.value = tokens
+                wait = (1 - tokens) * self.interval
+            time.sleep(wait)
+
+
+# Pausas para evitar rate limiting: más largas sin API key
+PAGESPEED_LIMITERS = {
+    True: TokenBucket(interval=1),
+    False: TokenBucket(interval=3),
+}
+
+# Caché en disco de resultados de PageSpeed (válido durante el día)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pagespeed_cache')
+CACHE_EXPIRE = 86400
+_cache = None
+
+
+def get_cache():
+    """Abre la caché en disco de forma perezosa (una vez por proceso)."""
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def init_worker(log_queue, log_level, pagespeed_limiters):
+    """Initializer de los workers del pool.
+    
+    Configura el logging hacia la cola del proceso principal y adopta los
+    limitadores de PageSpeed del proceso principal, de modo que el ritmo de
+    peticiones se comparte entre todos los workers en lugar de multiplicarse.
+    """
+    global PAGESPEED_LIMITERS
+    setup_logging(log_queue, log_level)
+    PAGESPEED_LIMITERS = pagespeed_limiters
+
+
+def normalize_url(url):
+    """Normaliza una URL para usarla como clave de caché (sin fragmento, host en minúsculas)."""
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        fragment=''
+    ))
+
+
+def load_env():
+    """Carga las variables del archivo .env en el entorno si existe.
+    
+    Returns:
+        True si se encontró el archivo .env
+    """
     env_path = os.path.join(os.path.dirname(__file__), '.env')
     if os.path.exists(env_path):
         load_dotenv(env_path)
+        return True
+    return False
+
+
+def load_api_key():
+    """Carga la API key desde el archivo .env si existe."""
+    if load_env():
         return os.getenv('API_KEY')
     return None
 
@@ -55,64 +193,169 @@ def is_url_friendly(url):
     return len(parse_qs(parsed.query)) == 0
 
 
-def fetch_page_selenium(url):
-    """Obtiene el contenido HTML de una URL usando Selenium para manejar contenido dinámico."""
-    driver = None
-    try:
-        # Configurar Selenium
-        options = webdriver.ChromeOptions()
-        options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--headless")  # Ejecutar en modo headless
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        
+def _build_options(local=True):
+    """Construye las opciones de Chrome headless.
+    
+    Args:
+        local: Si True, usa el binario de Chromium del sistema (no aplica a un Chrome remoto)
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--headless")  # Ejecutar en modo headless
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    
+    if local:
         # Use system chromium binary
         options.binary_location = "/usr/bin/chromium"
+    return options
+
+
+# Opciones de Chrome construidas una sola vez al importar el módulo
+_CHROME_OPTIONS = _build_options()
+_REMOTE_CHROME_OPTIONS = _build_options(local=False)
+
+
+class DriverPool:
+    """Mantiene un único driver de Chrome por proceso, reutilizado entre URLs.
+    
+    Si la variable de entorno SELENIUM_REMOTE_URL está definida (por ejemplo un
+    contenedor selenium/standalone-chrome ya arrancado), se conecta a ese
+    navegador con webdriver.Remote en lugar de lanzar Chromium localmente.
+    """
+    
+    _driver = None
+    _driver_path = None
+    _finalizer_registered = False
+    
+    @classmethod
+    def _create_driver(cls):
+        remote_url = os.getenv('SELENIUM_REMOTE_URL')
+        if remote_url:
+            return webdriver.Remote(command_executor=remote_url, options=_REMOTE_CHROME_OPTIONS)
         
         # Try to use system chromedriver first, fallback to ChromeDriverManager
-        try:
-            driver = webdriver.Chrome(options=options)
-        except Exception:
-            # Fallback to ChromeDriverManager
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(30)
+        if cls._driver_path is None:
+            try:
+                return webdriver.Chrome(options=_CHROME_OPTIONS)
+            except Exception:
+                # Fallback to ChromeDriverManager (se resuelve una sola vez por proceso)
+                cls._driver_path = ChromeDriverManager().install()
+        return webdriver.Chrome(service=Service(cls._driver_path), options=_CHROME_OPTIONS)
+    
+    @classmethod
+    def get(cls):
+        """Devuelve el driver del proceso, creándolo en el primer uso."""
+        if cls._driver is None:
+            driver = cls._create_driver()
+            driver.set_page_load_timeout(30)
+            cls._driver = driver
+            if not cls._finalizer_registered:
+                # Los workers de ProcessPoolExecutor no ejecutan atexit al salir,
+                # pero sí los finalizadores de multiprocessing (también en el proceso principal)
+                multiprocessing.util.Finalize(None, cls.close, exitpriority=10)
+                cls._finalizer_registered = True
+        return cls._driver
+    
+    @classmethod
+    def close(cls):
+        """Cierra el driver del proceso si existe."""
+        if cls._driver is not None:
+            try:
+                cls._driver.quit()
+            except Exception:
+                pass
+            cls._driver = None
+
+
+def wait_for_page_ready(driver, timeout=15, quiet_period=0.3, max_idle_wait=5):
+    """Espera a que la página termine de cargar en lugar de una pausa fija.
+    
+    Primero espera document.readyState == 'complete' y luego a que el número
+    de recursos cargados (performance entries) se mantenga estable durante
+    `quiet_period` segundos, con un máximo de `max_idle_wait` segundos.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState === 'complete'")
+        )
+    except TimeoutException:
+        return  # Usar lo que se haya renderizado hasta ahora
+    
+    count_script = "return performance.getEntriesByType('resource').length"
+    deadline = time.monotonic() + max_idle_wait
+    previous = driver.execute_script(count_script)
+    while time.monotonic() < deadline:
+        time.sleep(quiet_period)
+        current = driver.execute_script(count_script)
+        if current == previous:
+            return
+        previous = current
+
+
+def fetch_page_fast(url):
+    """Obtiene el HTML estático de una URL con una petición HTTP simple (sin navegador).
+    
+    Returns:
+        HTML de la respuesta (str si el servidor declara el charset, bytes si no),
+        o None si la petición falla
+    """
+    try:
+        response = SESSION.get(url, timeout=15, headers={'User-Agent': USER_AGENT}, allow_redirects=True)
+        if response.status_code >= 400:
+            logger.warning("        Descarga HTTP de %s ✗ HTTP %s", url, response.status_code)
+            return None
+        logger.info("        Descarga HTTP de %s ✓", url)
+        # Sin charset en Content-Type, requests decodifica como ISO-8859-1 e ignora
+        # <meta charset>; en ese caso se devuelven los bytes para que BeautifulSoup
+        # detecte la codificación desde el propio documento
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            return response.text
+        return response.content
+    except requests.RequestException as e:
+        logger.warning("        Descarga HTTP de %s ✗ Error: %s", url, e)
+        return None
+
+
+# Solo se construyen en el árbol las etiquetas que se analizan
+SEO_TAGS = SoupStrainer(['title', 'meta', 'h1', 'img'])
+
+
+def parse_seo_tags(html):
+    """Parsea el HTML (str o bytes) conservando solo título, meta, H1 e imágenes."""
+    return BeautifulSoup(html, 'lxml', parse_only=SEO_TAGS)
+
+
+def has_title_and_h1(soup):
+    """Indica si el HTML ya contiene título y H1 (no hace falta renderizar con JavaScript)."""
+    return soup.find('title') is not None and soup.find('h1') is not None
+
+
+def fetch_page_selenium(url):
+    """Obtiene el contenido HTML de una URL usando Selenium para manejar contenido dinámico."""
+    try:
+        driver = DriverPool.get()
         
-        print(f"        Cargando página con Selenium...", end=' ', flush=True)
         driver.get(url)
-        time.sleep(5)  # Esperar a que cargue el contenido dinámico
+        wait_for_page_ready(driver)  # Esperar a que cargue el contenido dinámico
         
         # Obtener HTML renderizado
         html = driver.execute_script("return document.documentElement.outerHTML;")
-        print("✓")
+        logger.info("        Carga con Selenium de %s ✓", url)
         
         return html
         
     except Exception as e:
-        print(f"✗ Error: {e}")
+        logger.warning("        Carga con Selenium de %s ✗ Error: %s", url, e)
+        # Descartar el driver por si quedó en mal estado; el siguiente uso crea uno nuevo
+        DriverPool.close()
         return None
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
-
-
-def check_keyword_in_text(text, keyword):
-    """Verifica si la keyword está presente en el texto (case-insensitive)."""
-    if not text:
-        return False
-    return keyword.lower() in text.lower()
 
 
-def get_pagespeed_insights(url, strategy='mobile', api_key=None, retry=False):
+def get_pagespeed_insights(url, strategy='mobile', api_key=None, retry=False, use_cache=True):
     """Obtiene métricas de PageSpeed Insights para una URL.
     
     Args:
@@ -120,10 +363,19 @@ def get_pagespeed_insights(url, strategy='mobile', api_key=None, retry=False):
         strategy: 'mobile' o 'desktop'
         api_key: API key de Google (opcional, pero recomendado para evitar límites)
         retry: Si es True, indica que es un reintento
+        use_cache: Si es True, reutiliza resultados del día guardados en disco
     
     Returns:
         dict con 'accessibility' y 'performance' scores (0-100), o None en caso de error
     """
+    cache_key = ('psi', normalize_url(url), strategy, datetime.now().strftime('%Y-%m-%d'))
+    if use_cache:
+        cached = get_cache().get(cache_key)
+        if cached is not None:
+            logger.info("        PageSpeed (%s) de %s desde caché ✓ (Acc: %s, Perf: %s)",
+                        strategy, url, cached['accessibility'], cached['performance'])
+            return cached
+    
     try:
         # URL de la API de PageSpeed Insights
         api_url = 'https://www.googleapis.com/pagespeedonline/v5/runPagespeed'
@@ -131,18 +383,20 @@ def get_pagespeed_insights(url, strategy='mobile', api_key=None, retry=False):
         params = {
             'url': url,
             'strategy': strategy,
-            'category': ['ACCESSIBILITY', 'PERFORMANCE']
+            'category': ['ACCESSIBILITY', 'PERFORMANCE'],
+            # Respuesta parcial: solo los dos scores que se usan, no el informe Lighthouse completo
+            'fields': 'lighthouseResult(categories(accessibility/score,performance/score))'
         }
         
         if api_key:
             params['key'] = api_key
         
         retry_text = " (reintento)" if retry else ""
-        print(f"        Obteniendo PageSpeed ({strategy}){retry_text}...", end=' ', flush=True)
-        response = requests.get(api_url, params=params, timeout=30)
+        PAGESPEED_LIMITERS[bool(api_key)].acquire()
+        response = SESSION.get(api_url, params=params, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Extraer scores de las categorías
         lighthouse = data.get('lighthouseResult', {})
@@ -155,237 +409,311 @@ def get_pagespeed_insights(url, strategy='mobile', api_key=None, retry=False):
         accessibility = int(accessibility_score * 100) if accessibility_score is not None else None
         performance = int(performance_score * 100) if performance_score is not None else None
         
-        print(f"✓ (Acc: {accessibility}, Perf: {performance})")
-        
-        # Pausa más larga para evitar rate limiting (sin API key)
-        time.sleep(3 if not api_key else 1)
+        logger.info("        PageSpeed (%s)%s de %s ✓ (Acc: %s, Perf: %s)",
+                    strategy, retry_text, url, accessibility, performance)
         
-        return {
+        metrics = {
             'accessibility': accessibility,
             'performance': performance
         }
         
+        # Solo guardar resultados completos para que los incompletos se reintenten
+        if use_cache and accessibility is not None and performance is not None:
+            get_cache().set(cache_key, metrics, expire=CACHE_EXPIRE)
+        
+        return metrics
+        
     except requests.RequestException as e:
         # Si es un error 429 (rate limiting), detener la ejecución
         if hasattr(e, 'response') and e.response is not None:
             if e.response.status_code == 429:
-                print(f"✗ Error: Rate limiting (429)")
+                logger.error("        PageSpeed (%s) de %s ✗ Error: Rate limiting (429)", strategy, url)
                 raise Exception(f"Rate limiting detectado (429): Google PageSpeed API ha limitado las peticiones. Por favor espera un momento e intenta nuevamente.") from e
             elif e.response.status_code == 400:
                 # Reintentar una vez si no es un reintento ya
                 if not retry:
-                    print(f"✗ Error 400, reintentando...")
+                    logger.warning("        PageSpeed (%s) de %s ✗ Error 400, reintentando...", strategy, url)
                     time.sleep(5)  # Esperar 5 segundos antes de reintentar
-                    return get_pagespeed_insights(url, strategy, api_key, retry=True)
+                    return get_pagespeed_insights(url, strategy, api_key, retry=True, use_cache=use_cache)
                 else:
-                    print(f"✗ Error 400 persistente: URL no analizable por PageSpeed")
+                    logger.warning("        PageSpeed (%s) de %s ✗ Error 400 persistente: URL no analizable por PageSpeed", strategy, url)
                     return {'accessibility': None, 'performance': None}
-        print(f"✗ Error: {e}")
+        logger.warning("        PageSpeed (%s) de %s ✗ Error: %s", strategy, url, e)
         return {'accessibility': None, 'performance': None}
     except Exception as e:
-        print(f"✗ Error inesperado: {e}")
+        logger.warning("        PageSpeed (%s) de %s ✗ Error inesperado: %s", strategy, url, e)
         return {'accessibility': None, 'performance': None}
 
 
-def analyze_page(url, keyword, include_pagespeed=True, api_key=None):
-    """Analiza una página web y verifica la presencia de la keyword en elementos SEO.
+def build_keyword_automaton(keywords):
+    """Construye un autómata Aho-Corasick con las keywords en minúsculas.
+    
+    Permite buscar todas las keywords en un texto con una sola pasada.
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        if keyword:
+            automaton.add_word(keyword.lower(), keyword.lower())
+    if len(automaton) > 0:
+        automaton.make_automaton()
+    return automaton
+
+
+def find_keywords(automaton, text):
+    """Devuelve el conjunto de keywords (en minúsculas) presentes en el texto (case-insensitive)."""
+    if not text:
+        return set()
+    # La keyword vacía coincide con cualquier texto no vacío
+    found = {''}
+    if automaton.kind == ahocorasick.AHOCORASICK:
+        found.update(keyword for _, keyword in automaton.iter(text.lower()))
+    return found
+
+
+def error_result(url, keyword):
+    """Resultado para una keyword cuando no se pudo obtener la página."""
+    return {
+        'URL': url,
+        'Keyword': keyword,
+        'Título': 'ERROR',
+        'Keyword en Título': False,
+        'Meta Descripción': 'ERROR',
+        'Keyword en Meta Descripción': False,
+        'H1': 'ERROR',
+        'Keyword en H1': False,
+        'Alt Text Imágenes': 'ERROR',
+        'Keyword en Alt Text': False,
+        'Keyword en Alt Ratio': '0 de 0',
+        'Alt Images With Keyword': 0,
+        'Alt Total Images': 0,
+        'URL Amigable': is_url_friendly(url),
+        'Accesibilidad(Mobile)': None,
+        'PageSpeed(Mobile)': None,
+        'Accesibilidad(Web)': None,
+        'PageSpeed(Web)': None
+    }
+
+
+def fetch_and_parse(url, include_pagespeed=True, api_key=None, use_cache=True, force_selenium=False):
+    """Obtiene la página (una sola vez) y extrae los elementos SEO y métricas de PageSpeed.
+    
+    Primero intenta una petición HTTP simple; si el HTML no trae título y H1
+    (página renderizada con JavaScript) se recurre a Selenium.
     
     Args:
         url: URL a analizar
-        keyword: Palabra clave a buscar
         include_pagespeed: Si True, incluye análisis de PageSpeed Insights
         api_key: API key de Google para PageSpeed (opcional)
-    """
-    html = fetch_page_selenium(url)
+        use_cache: Si True, usa la caché en disco de PageSpeed
+        force_selenium: Si True, usa siempre Selenium
     
-    if not html:
-        return {
-            'URL': url,
-            'Keyword': keyword,
-            'Título': 'ERROR',
-            'Keyword en Título': False,
-            'Meta Descripción': 'ERROR',
-            'Keyword en Meta Descripción': False,
-            'H1': 'ERROR',
-            'Keyword en H1': False,
-            'Alt Text Imágenes': 'ERROR',
-            'Keyword en Alt Text': False,
-            'Keyword en Alt Ratio': '0 de 0',
-            'Alt Images With Keyword': 0,
-            'Alt Total Images': 0,
-            'URL Amigable': is_url_friendly(url),
-            'Accesibilidad(Mobile)': None,
-            'PageSpeed(Mobile)': None,
-            'Accesibilidad(Web)': None,
-            'PageSpeed(Web)': None
-        }
-    
-    soup = BeautifulSoup(html, 'html.parser')
+    Returns:
+        dict con los elementos extraídos, o None si no se pudo obtener la página
+    """
+    soup = None
+    if not force_selenium:
+        html = fetch_page_fast(url)
+        if html:
+            soup = parse_seo_tags(html)
+            if not has_title_and_h1(soup):
+                logger.info("        HTML de %s sin título o H1, usando Selenium...", url)
+                soup = None
+    
+    if soup is None:
+        html = fetch_page_selenium(url)
+        if not html:
+            return None
+        soup = parse_seo_tags(html)
     
     # 1. Título
     title_tag = soup.find('title')
     title = title_tag.get_text(strip=True) if title_tag else ''
-    keyword_in_title = check_keyword_in_text(title, keyword)
     
     # 2. Meta descripción
     meta_desc_tag = soup.find('meta', attrs={'name': 'description'})
     meta_desc = meta_desc_tag.get('content', '') if meta_desc_tag else ''
-    keyword_in_meta = check_keyword_in_text(meta_desc, keyword)
     
     # 3. H1 - Use separator to preserve spaces between nested elements
     h1_tags = soup.find_all('h1')
     h1_text = ' | '.join([h1.get_text(separator=' ', strip=True) for h1 in h1_tags])
-    keyword_in_h1 = check_keyword_in_text(h1_text, keyword)
     
     # 4. Alt text de imágenes
-    img_tags = soup.find_all('img')
-    alt_texts = [img.get('alt', '') for img in img_tags if img.get('alt')]
-    alt_text_combined = ' | '.join(alt_texts)
+    alt_texts = []
+    for img in soup.find_all('img'):
+        alt = img.get('alt')
+        if alt:
+            alt_texts.append(alt)
     
-    # Contar imágenes con keyword en alt text
-    total_images_with_alt = len(alt_texts)
-    images_with_keyword = sum(1 for alt in alt_texts if check_keyword_in_text(alt, keyword))
-    keyword_in_alt_ratio = f"{images_with_keyword} de {total_images_with_alt}" if total_images_with_alt > 0 else "0 de 0"
-    keyword_in_alt = any(check_keyword_in_text(alt, keyword) for alt in alt_texts)
-    
-    # 5. URL amigable
-    url_friendly = is_url_friendly(url)
-    
-    # 6. PageSpeed Insights (Mobile y Desktop)
+    # 5. PageSpeed Insights (Mobile y Desktop)
     mobile_metrics = {'accessibility': None, 'performance': None}
     desktop_metrics = {'accessibility': None, 'performance': None}
     
     if include_pagespeed:
-        mobile_metrics = get_pagespeed_insights(url, 'mobile', api_key)
-        desktop_metrics = get_pagespeed_insights(url, 'desktop', api_key)
+        # Mobile y desktop en paralelo: ambas llamadas son I/O
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mobile_future = executor.submit(get_pagespeed_insights, url, 'mobile', api_key, use_cache=use_cache)
+            desktop_future = executor.submit(get_pagespeed_insights, url, 'desktop', api_key, use_cache=use_cache)
+            mobile_metrics, desktop_metrics = mobile_future.result(), desktop_future.result()
         
         # Reintentar si los resultados de desktop son None
         if desktop_metrics['accessibility'] is None or desktop_metrics['performance'] is None:
-            print("        ⚠ Resultados de desktop incompletos, reintentando...")
-            desktop_metrics = get_pagespeed_insights(url, 'desktop', api_key, retry=True)
+            logger.warning("        ⚠ Resultados de desktop incompletos para %s, reintentando...", url)
+            desktop_metrics = get_pagespeed_insights(url, 'desktop', api_key, retry=True, use_cache=use_cache)
     
     return {
-        'URL': url,
-        'Keyword': keyword,
-        'Título': title,
-        'Keyword en Título': keyword_in_title,
-        'Meta Descripción': meta_desc,
-        'Keyword en Meta Descripción': keyword_in_meta,
-        'H1': h1_text if h1_text else 'No H1 encontrado',
-        'Keyword en H1': keyword_in_h1,
-        'Alt Text Imágenes': alt_text_combined if alt_text_combined else 'Sin alt text',
-        'Keyword en Alt Text': keyword_in_alt,
-        'Keyword en Alt Ratio': keyword_in_alt_ratio,
-        'Alt Images With Keyword': images_with_keyword,
-        'Alt Total Images': total_images_with_alt,
-        'URL Amigable': url_friendly,
-        'Accesibilidad(Mobile)': mobile_metrics['accessibility'],
-        'PageSpeed(Mobile)': mobile_metrics['performance'],
-        'Accesibilidad(Web)': desktop_metrics['accessibility'],
-        'PageSpeed(Web)': desktop_metrics['performance']
+        'url': url,
+        'title': title,
+        'meta_desc': meta_desc,
+        'h1_text': h1_text,
+        'alt_texts': alt_texts,
+        'url_friendly': is_url_friendly(url),
+        'mobile': mobile_metrics,
+        'desktop': desktop_metrics
     }
 
 
-def create_excel_report(results, output_file='seo_report.xlsx'):
-    """Crea un reporte en Excel con formato condicional."""
-    # Crear libro de trabajo
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Análisis SEO"
+def score_keywords(parsed, keywords):
+    """Verifica las keywords sobre una página ya obtenida, sin volver a cargarla.
     
-    # Definir colores
-    green_fill = PatternFill(start_color="00FF00", end_color="00FF00", fill_type="solid")
-    yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-    red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+    Args:
+        parsed: dict devuelto por fetch_and_parse
+        keywords: Lista de palabras clave a buscar
     
-    # Encabezados
-    headers = [
-        'URL', 'Keyword', 
-        'Título', '✓ Keyword en Título',
-        'Meta Descripción', '✓ Keyword en Meta',
-        'H1', '✓ Keyword en H1',
-        'Alt Text Imágenes', 'Keyword en Alt Text',
-        '✓ URL Amigable',
-        'Accesibilidad(Mobile)', 'PageSpeed(Mobile)',
-        'Accesibilidad(Web)', 'PageSpeed(Web)'
-    ]
+    Returns:
+        Lista de resultados, uno por keyword
+    """
+    automaton = build_keyword_automaton(keywords)
+    title_hits = find_keywords(automaton, parsed['title'])
+    meta_hits = find_keywords(automaton, parsed['meta_desc'])
+    h1_hits = find_keywords(automaton, parsed['h1_text'])
+    
+    # Una sola pasada sobre los alt: cuenta, para cada keyword, las imágenes que la contienen
+    alt_texts = parsed['alt_texts']
+    alt_counts = Counter()
+    for alt in alt_texts:
+        alt_counts.update(find_keywords(automaton, alt))
+    alt_text_combined = ' | '.join(alt_texts)
+    total_images_with_alt = len(alt_texts)
+    
+    h1_text = parsed['h1_text']
+    mobile_metrics = parsed['mobile']
+    desktop_metrics = parsed['desktop']
+    
+    results = []
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        
+        # Imágenes con keyword en alt text
+        images_with_keyword = alt_counts[keyword_lower]
+        keyword_in_alt_ratio = f"{images_with_keyword} de {total_images_with_alt}" if total_images_with_alt > 0 else "0 de 0"
+        
+        results.append({
+            'URL': parsed['url'],
+            'Keyword': keyword,
+            'Título': parsed['title'],
+            'Keyword en Título': keyword_lower in title_hits,
+            'Meta Descripción': parsed['meta_desc'],
+            'Keyword en Meta Descripción': keyword_lower in meta_hits,
+            'H1': h1_text if h1_text else 'No H1 encontrado',
+            'Keyword en H1': keyword_lower in h1_hits,
+            'Alt Text Imágenes': alt_text_combined if alt_text_combined else 'Sin alt text',
+            'Keyword en Alt Text': images_with_keyword > 0,
+            'Keyword en Alt Ratio': keyword_in_alt_ratio,
+            'Alt Images With Keyword': images_with_keyword,
+            'Alt Total Images': total_images_with_alt,
+            'URL Amigable': parsed['url_friendly'],
+            'Accesibilidad(Mobile)': mobile_metrics['accessibility'],
+            'PageSpeed(Mobile)': mobile_metrics['performance'],
+            'Accesibilidad(Web)': desktop_metrics['accessibility'],
+            'PageSpeed(Web)': desktop_metrics['performance']
+        })
+    
+    return results
+
+
+def analyze_page(url, keywords, include_pagespeed=True, api_key=None, use_cache=True, force_selenium=False):
+    """Analiza una página web y verifica la presencia de las keywords en elementos SEO.
     
-    ws.append(headers)
+    La página y PageSpeed se obtienen una sola vez para todas las keywords.
     
-    # Hacer los encabezados en negrita
-    for cell in ws[1]:
-        cell.font = openpyxl.styles.Font(bold=True)
+    Args:
+        url: URL a analizar
+        keywords: Lista de palabras clave a buscar
+        include_pagespeed: Si True, incluye análisis de PageSpeed Insights
+        api_key: API key de Google para PageSpeed (opcional)
+        use_cache: Si True, usa la caché en disco de PageSpeed
+        force_selenium: Si True, carga la página siempre con Selenium
     
-    # Agregar datos
-    for result in results:
-        row = [
-            result['URL'],
-            result['Keyword'],
-            result['Título'],
-            'SÍ' if result['Keyword en Título'] else 'NO',
-            result['Meta Descripción'],
-            'SÍ' if result['Keyword en Meta Descripción'] else 'NO',
-            result['H1'],
-            'SÍ' if result['Keyword en H1'] else 'NO',
-            result['Alt Text Imágenes'],
-            result['Keyword en Alt Ratio'],  # Mostrar ratio en lugar de SÍ/NO
-            'SÍ' if result['URL Amigable'] else 'NO',
-            result['Accesibilidad(Mobile)'] if result['Accesibilidad(Mobile)'] is not None else 'N/A',
-            result['PageSpeed(Mobile)'] if result['PageSpeed(Mobile)'] is not None else 'N/A',
-            result['Accesibilidad(Web)'] if result['Accesibilidad(Web)'] is not None else 'N/A',
-            result['PageSpeed(Web)'] if result['PageSpeed(Web)'] is not None else 'N/A'
-        ]
-        ws.append(row)
+    Returns:
+        Lista de resultados, uno por keyword
+    """
+    parsed = fetch_and_parse(url, include_pagespeed, api_key, use_cache, force_selenium)
+    if parsed is None:
+        return [error_result(url, keyword) for keyword in keywords]
+    return score_keywords(parsed, keywords)
+
+
+def _analyze_one_site(task):
+    """Analiza todas las keywords de un sitio. Se ejecuta en un proceso del pool.
     
-    # Aplicar formato condicional (colorear celdas de verificación)
-    check_columns = [4, 6, 8, 11]  # Columnas D, F, H, K (sin J porque ahora es ratio)
-    
-    for row_idx in range(2, ws.max_row + 1):
-        for col_idx in check_columns:
-            cell = ws.cell(row=row_idx, column=col_idx)
-            if cell.value == 'SÍ':
-                cell.fill = green_fill
-            elif cell.value == 'NO':
-                cell.fill = red_fill
-    
-    # Aplicar formato condicional a la columna J (Keyword en Alt - ratio)
-    for row_idx in range(2, ws.max_row + 1):
-        cell = ws.cell(row=row_idx, column=10)  # Columna J
-        cell_value = str(cell.value)
-        
-        # Extraer números del formato "X de Y"
-        if ' de ' in cell_value:
-            try:
-                parts = cell_value.split(' de ')
-                with_keyword = int(parts[0])
-                total = int(parts[1])
-                
-                # Verde si más de la mitad tienen keyword, rojo si no
-                if total > 0:
-                    if with_keyword > total / 2:
-                        cell.fill = green_fill
-                    else:
-                        cell.fill = red_fill
-            except (ValueError, IndexError):
-                pass  # Si no se puede parsear, no colorear
-    
-    # Aplicar formato condicional a las columnas de PageSpeed (L, M, N, O)
-    pagespeed_columns = [12, 13, 14, 15]  # Columnas L, M, N, O
-    
-    for row_idx in range(2, ws.max_row + 1):
-        for col_idx in pagespeed_columns:
-            cell = ws.cell(row=row_idx, column=col_idx)
-            # Solo colorear si el valor es numérico
-            if isinstance(cell.value, (int, float)):
-                score = cell.value
-                if 0 <= score <= 49:
-                    cell.fill = red_fill
-                elif 50 <= score <= 89:
-                    cell.fill = yellow_fill
-                elif 90 <= score <= 100:
-                    cell.fill = green_fill
-    
-    # Ajustar ancho de columnas
+    Args:
+        task: tupla (url, keywords_list, include_pagespeed, api_key, use_cache, force_selenium)
+    
+    Returns:
+        Lista de resultados, uno por keyword
+    """
+    url, keywords_list, include_pagespeed, api_key, use_cache, force_selenium = task
+    logger.info("    Analizando: %s", url)
+    return analyze_page(url, keywords_list, include_pagespeed, api_key, use_cache, force_selenium)
+
+
+# Colores del reporte (se crean una vez y se reutilizan en todas las celdas)
+GREEN_FILL = PatternFill(start_color="00FF00", end_color="00FF00", fill_type="solid")
+YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+RED_FILL = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+
+
+def score_fill(score):
+    """Color para un score de PageSpeed: rojo 0-49, amarillo 50-89, verde 90-100."""
+    if score is None or not 0 <= score <= 100:
+        return None
+    if score < 50:
+        return RED_FILL
+    if score < 90:
+        return YELLOW_FILL
+    return GREEN_FILL
+
+
+def ratio_fill(with_keyword, total):
+    """Color para el ratio de alt text: verde si más de la mitad tienen keyword."""
+    if total <= 0:
+        return None
+    return GREEN_FILL if with_keyword * 2 > total else RED_FILL
+
+
+def create_excel_report(results, output_file='seo_report.xlsx'):
+    """Crea un reporte en Excel con formato condicional.
+    
+    Usa el modo write-only de openpyxl: las filas se escriben en streaming con
+    su color ya asignado, sin mantener toda la hoja en memoria.
+    """
+    # Crear libro de trabajo
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Análisis SEO")
+    
+    def make_cell(value, fill=None, font=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if fill is not None:
+            cell.fill = fill
+        if font is not None:
+            cell.font = font
+        return cell
+    
+    # Columnas de verificación (verde = SÍ, rojo = NO)
+    def check_cell(passed):
+        return make_cell('SÍ' if passed else 'NO', GREEN_FILL if passed else RED_FILL)
+    
+    # Ajustar ancho de columnas (en modo write-only debe hacerse antes de escribir filas)
     column_widths = {
         'A': 50,  # URL
         'B': 30,  # Keyword
@@ -407,11 +735,64 @@ def create_excel_report(results, output_file='seo_report.xlsx'):
     for col, width in column_widths.items():
         ws.column_dimensions[col].width = width
     
+    # Encabezados
+    headers = [
+        'URL', 'Keyword', 
+        'Título', '✓ Keyword en Título',
+        'Meta Descripción', '✓ Keyword en Meta',
+        'H1', '✓ Keyword en H1',
+        'Alt Text Imágenes', 'Keyword en Alt Text',
+        '✓ URL Amigable',
+        'Accesibilidad(Mobile)', 'PageSpeed(Mobile)',
+        'Accesibilidad(Web)', 'PageSpeed(Web)'
+    ]
+    
+    # Encabezados en negrita
+    bold_font = openpyxl.styles.Font(bold=True)
+    ws.append([make_cell(header, font=bold_font) for header in headers])
+    
+    # Agregar datos, coloreando cada celda al escribirla
+    pagespeed_keys = ('Accesibilidad(Mobile)', 'PageSpeed(Mobile)', 'Accesibilidad(Web)', 'PageSpeed(Web)')
+    for result in results:
+        row = [
+            make_cell(result['URL']),
+            make_cell(result['Keyword']),
+            make_cell(result['Título']),
+            check_cell(result['Keyword en Título']),
+            make_cell(result['Meta Descripción']),
+            check_cell(result['Keyword en Meta Descripción']),
+            make_cell(result['H1']),
+            check_cell(result['Keyword en H1']),
+            make_cell(result['Alt Text Imágenes']),
+            # Mostrar ratio "X de Y" en lugar de SÍ/NO, coloreado con los contadores numéricos
+            make_cell(result['Keyword en Alt Ratio'],
+                      ratio_fill(result['Alt Images With Keyword'], result['Alt Total Images'])),
+            check_cell(result['URL Amigable'])
+        ]
+        
+        # Columnas de PageSpeed (L, M, N, O)
+        for key in pagespeed_keys:
+            score = result[key]
+            row.append(make_cell(score if score is not None else 'N/A', score_fill(score)))
+        
+        ws.append(row)
+    
     # Guardar archivo
     wb.save(output_file)
     print(f"\n✓ Reporte generado: {output_file}")
 
 
+def positive_int(value):
+    """Tipo de argparse para enteros mayores que cero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' no es un número entero")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que 0 (recibido: {number})")
+    return number
+
+
 def main():
     """Función principal."""
     parser = argparse.ArgumentParser(
@@ -422,6 +803,9 @@ Ejemplos de uso:
   %(prog)s                                     # Análisis completo con PageSpeed
   %(prog)s --no-pagespeed                      # Solo análisis SEO sin PageSpeed
   %(prog)s --api-key YOUR_KEY                  # Con API key de Google
+  %(prog)s --no-cache                          # Consultar PageSpeed sin usar la caché
+  %(prog)s --force-selenium                    # Renderizar siempre con el navegador
+  %(prog)s --quiet                             # Sin mensajes de progreso por URL
   %(prog)s --config-file custom.config         # Usar archivo de config personalizado
   %(prog)s --config-file sites.json --api-key YOUR_KEY  # Personalizado con API key
         """
@@ -447,10 +831,37 @@ Ejemplos de uso:
         help='API key de Google para PageSpeed Insights (evita límites de tasa)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignorar la caché en disco de PageSpeed y consultar siempre la API'
+    )
+    
+    parser.add_argument(
+        '--force-selenium',
+        action='store_true',
+        help='Cargar siempre las páginas con Selenium (sin intentar HTTP simple primero)'
+    )
+    
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Mostrar solo avisos y errores del progreso (sin mensajes por URL)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=4,
+        help='Número de sitios analizados en paralelo (default: 4)'
+    )
+    
     args = parser.parse_args()
     
     # Extraer variables de los argumentos
     include_pagespeed = not args.no_pagespeed
+    # Cargar .env siempre (p. ej. SELENIUM_REMOTE_URL), antes de crear el pool de workers
+    load_env()
     # Load API key from .env if not provided via command line
     api_key = args.api_key or load_api_key()
     
@@ -481,9 +892,9 @@ Ejemplos de uso:
         print("PageSpeed Insights: DESACTIVADO")
     print()
     
-    # Analizar cada página
-    results = []
-    for idx, site in enumerate(config, 1):
+    # Preparar una tarea por sitio
+    tasks = []
+    for site in config:
         url = site.get('URL')
         
         # Manejar keywords como array o string
@@ -495,37 +906,37 @@ Ejemplos de uso:
         else:
             keywords_list = ['']
         
-        print(f"[{idx}/{len(config)}] Analizando: {url}")
-        keywords_formatted = ', '.join([f"'{k}'" for k in keywords_list])
-        print(f"    Keywords: {keywords_formatted}")
-        
-        # Analizar la página una vez y reutilizar para todos los keywords
-        # Primero obtenemos el HTML y PageSpeed solo una vez
-        first_result = analyze_page(url, keywords_list[0], include_pagespeed, api_key)
-        
-        # Para cada keyword, crear un resultado
-        for keyword in keywords_list:
-            if keyword == keywords_list[0]:
-                # Ya tenemos el resultado del primer keyword
-                result = first_result
-            else:
-                # Para los demás keywords, reutilizar PageSpeed pero recalcular checks de keyword
-                result = analyze_page(url, keyword, include_pagespeed=False, api_key=api_key)
-                # Copiar métricas de PageSpeed del primer resultado
-                result['Accesibilidad(Mobile)'] = first_result['Accesibilidad(Mobile)']
-                result['PageSpeed(Mobile)'] = first_result['PageSpeed(Mobile)']
-                result['Accesibilidad(Web)'] = first_result['Accesibilidad(Web)']
-                result['PageSpeed(Web)'] = first_result['PageSpeed(Web)']
-            
-            results.append(result)
-        
-        # Mostrar resumen agregado
-        total_checks = 0
-        total_passed = 0
-        for keyword in keywords_list:
-            # Encontrar el resultado para este keyword
-            for r in results:
-                if r['URL'] == url and r['Keyword'] == keyword:
+        tasks.append((url, keywords_list, include_pagespeed, api_key, not args.no_cache, args.force_selenium))
+    
+    # Los workers envían sus logs a una cola; un único listener los escribe en stdout
+    log_level = logging.WARNING if args.quiet else logging.INFO
+    log_queue = multiprocessing.Queue()
+    log_handler = logging.StreamHandler(sys.stdout)
+    log_handler.setFormatter(logging.Formatter('%(message)s'))
+    log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+    log_listener.start()
+    setup_logging(log_queue, log_level)
+    
+    # Analizar los sitios en paralelo: cada proceso usa su propio Chrome
+    results = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=init_worker,
+            initargs=(log_queue, log_level, PAGESPEED_LIMITERS)
+        ) as executor:
+            for idx, (task, site_results) in enumerate(zip(tasks, executor.map(_analyze_one_site, tasks)), 1):
+                url, keywords_list = task[0], task[1]
+                results.extend(site_results)
+                
+                print(f"[{idx}/{len(config)}] Analizado: {url}")
+                keywords_formatted = ', '.join([f"'{k}'" for k in keywords_list])
+                print(f"    Keywords: {keywords_formatted}")
+                
+                # Mostrar resumen agregado
+                total_checks = 0
+                total_passed = 0
+                for r in site_results:
                     checks = [
                         r['Keyword en Título'],
                         r['Keyword en Meta Descripción'],
@@ -536,10 +947,11 @@ Ejemplos de uso:
                     passed = sum(checks)
                     total_checks += 5
                     total_passed += passed
-                    print(f"      '{keyword}': {passed}/5 verificaciones pasadas")
-                    break
-        
-        print(f"    ✓ Total: {total_passed}/{total_checks} verificaciones pasadas\n")
+                    print(f"      '{r['Keyword']}': {passed}/5 verificaciones pasadas")
+                
+                print(f"    ✓ Total: {total_passed}/{total_checks} verificaciones pasadas\n")
+    finally:
+        log_listener.stop()
     
     # Generar reporte Excel
     # Generar reporte Excel con fecha en el nombre